@@ -10,7 +10,41 @@ import os
 import subprocess
 import re
 
-def analyse_cloudformation_costs(template_file, output_file, region="eu-west-1"):
+import numpy as np
+
+# Usage-driven rates (USD, eu-west-1) for charges the hourly pricing misses
+USAGE_RATES = {
+    "nat_per_gb": 0.048,                 # NAT Gateway data processing
+    "alb_per_lcu_hour": 0.008,           # ALB Load Balancer Capacity Units
+    "rds_storage_per_gb_month": 0.127,   # RDS gp2 storage
+    "rds_iops_per_month": 0.11,          # RDS provisioned IOPS
+    "eip_idle_per_hour": 0.005,          # Elastic IP allocated but not attached
+    "data_transfer_out_per_gb": 0.09     # Internet egress
+}
+
+# Usage per tier; quantities are per resource except data_transfer_out_gb.
+# A metric defined in several tiers is sampled per tier and summed.
+DEFAULT_USAGE_PROFILE = {
+    "draws": 10000,
+    "seed": 42,
+    "tiers": {
+        "presentation": {
+            "alb_lcu_per_hour": {"distribution": "lognormal", "median": 0.5, "sigma": 0.6},
+            "data_transfer_out_gb": {"distribution": "lognormal", "median": 50, "sigma": 0.8}
+        },
+        "application": {
+            "nat_processed_gb": {"distribution": "lognormal", "median": 30, "sigma": 0.8},
+            "eip_idle_hours": {"distribution": "fixed", "value": 0}
+        },
+        "data": {
+            "rds_storage_gb": {"distribution": "fixed", "value": 20},
+            "rds_provisioned_iops": {"distribution": "fixed", "value": 0}
+        }
+    }
+}
+
+
+def analyse_cloudformation_costs(template_file, output_file, region="eu-west-1", usage_profile=None):
     """
     Analyses costs for CloudFormation templates
     
@@ -18,6 +52,9 @@ def analyse_cloudformation_costs(template_file, output_file, region="eu-west-1")
         template_file (str): Path to CloudFormation template file
         output_file (str): Where to save the cost analysis
         region (str): AWS region for pricing
+        usage_profile (dict, optional): Usage distributions per tier; when
+            given, usage-driven charges are simulated and resource_breakdown
+            reports P50/P95 monthly costs per service
     """
     # Map region to AWS pricing location string
     region_map = {
@@ -214,6 +251,10 @@ def analyse_cloudformation_costs(template_file, output_file, region="eu-west-1")
             "estimated_savings": nat_price * hours_per_month * (nat_count - 2)
         })
     
+    # Simulate usage-driven charges; simulation was asked for, so a bad profile fails
+    if usage_profile:
+        simulate_usage_costs(cost_analysis, usage_profile, hours_per_month)
+    
     # Save the analysis
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     with open(output_file, 'w') as f:
@@ -221,9 +262,177 @@ def analyse_cloudformation_costs(template_file, output_file, region="eu-west-1")
     
     print(f"CloudFormation cost analysis completed")
     print(f"Estimated monthly cost: ${cost_analysis['monthly_cost_estimate']:.2f}")
-    print("\nBreakdown by service:")
-    for service, cost in sorted(cost_analysis["resource_breakdown"].items(), key=lambda x: x[1], reverse=True):
-        print(f"  {service}: ${cost:.2f}")
+    if "simulation" in cost_analysis:
+        simulation = cost_analysis["simulation"]
+        print(f"Simulated monthly cost: P50 ${simulation['monthly_cost_p50']:.2f}, "
+              f"P95 ${simulation['monthly_cost_p95']:.2f} ({simulation['draws']} draws)")
+        print("\nBreakdown by service (P50 / P95):")
+        for service, cost in sorted(cost_analysis["resource_breakdown"].items(), key=lambda x: x[1]["p95"], reverse=True):
+            print(f"  {service}: ${cost['p50']:.2f} / ${cost['p95']:.2f}")
+    else:
+        print("\nBreakdown by service:")
+        for service, cost in sorted(cost_analysis["resource_breakdown"].items(), key=lambda x: x[1], reverse=True):
+            print(f"  {service}: ${cost:.2f}")
+    
+    return cost_analysis
+
+
+# Parameters each usage distribution needs ("fixed" defaults its value to 0)
+USAGE_DISTRIBUTIONS = {
+    "fixed": (),
+    "uniform": ("low", "high"),
+    "normal": ("mean", "std"),
+    "lognormal": ("median", "sigma"),
+    "triangular": ("low", "mode", "high")
+}
+
+
+def validate_usage_profile(usage_profile):
+    """
+    Check every usage spec names a known distribution and its parameters
+    
+    Raises:
+        ValueError: Naming the tier, metric and the problem
+    """
+    for tier, metrics in usage_profile.get("tiers", {}).items():
+        for metric, spec in metrics.items():
+            if not isinstance(spec, dict):
+                raise ValueError(f"Usage spec {tier}.{metric} must be an object")
+            distribution = spec.get("distribution", "fixed")
+            if distribution not in USAGE_DISTRIBUTIONS:
+                raise ValueError(f"Usage spec {tier}.{metric}: unknown distribution '{distribution}'")
+            missing = [name for name in USAGE_DISTRIBUTIONS[distribution] if name not in spec]
+            if missing:
+                raise ValueError(f"Usage spec {tier}.{metric}: {distribution} distribution is missing "
+                                 f"{', '.join(repr(name) for name in missing)}")
+
+
+def sample_usage(spec, draws, rng):
+    """
+    Draw usage samples from a distribution spec
+    
+    Args:
+        spec (dict): {"distribution": fixed|uniform|normal|lognormal|triangular, ...parameters}
+        draws (int): Number of samples
+        rng (numpy.random.Generator): Random generator
+    
+    Returns:
+        ndarray: Non-negative usage samples
+    """
+    distribution = spec.get("distribution", "fixed")
+    missing = [name for name in USAGE_DISTRIBUTIONS.get(distribution, ()) if name not in spec]
+    if missing:
+        raise ValueError(f"{distribution} distribution is missing {', '.join(repr(name) for name in missing)}")
+    
+    if distribution == "fixed":
+        samples = np.full(draws, float(spec.get("value", 0)))
+    elif distribution == "uniform":
+        samples = rng.uniform(spec["low"], spec["high"], draws)
+    elif distribution == "normal":
+        samples = rng.normal(spec["mean"], spec["std"], draws)
+    elif distribution == "lognormal":
+        samples = rng.lognormal(np.log(spec["median"]), spec["sigma"], draws)
+    elif distribution == "triangular":
+        samples = rng.triangular(spec["low"], spec["mode"], spec["high"], draws)
+    else:
+        raise ValueError(f"Unknown usage distribution: {distribution}")
+    
+    return np.clip(samples, 0, None)
+
+
+def simulate_usage_costs(cost_analysis, usage_profile, hours_per_month=730):
+    """
+    Monte Carlo estimate of monthly costs including usage-driven charges
+    
+    All draws are sampled and costed as whole arrays. The fixed hourly
+    costs already in resource_breakdown are added to every draw, and the
+    breakdown is replaced with P50/P95/mean figures per service.
+    
+    Args:
+        cost_analysis (dict): Cost analysis with hourly-rate resources filled in
+        usage_profile (dict): Draws, seed, rate overrides and usage distributions per tier
+        hours_per_month (int): Hours billed per month
+    
+    Raises:
+        ValueError: If a usage spec is malformed
+    """
+    validate_usage_profile(usage_profile)
+    draws = int(usage_profile.get("draws", 10000))
+    rng = np.random.default_rng(usage_profile.get("seed"))
+    rates = {**USAGE_RATES, **usage_profile.get("rates", {})}
+    
+    zeros = np.zeros(draws)
+    
+    # Sample each tier independently; a metric used by several tiers is their sum
+    tier_usage = {}
+    usage = {}
+    for tier, metrics in usage_profile.get("tiers", {}).items():
+        for metric, spec in metrics.items():
+            samples = sample_usage(spec, draws, rng)
+            tier_usage[(tier, metric)] = samples
+            usage[metric] = usage.get(metric, zeros) + samples
+    
+    resources = cost_analysis["resources"]
+    
+    def count(name):
+        return resources.get(name, {}).get("count", 0)
+    
+    # The baseline bills every EIP at the attached rate for the whole month.
+    # Idle hours (allocated but unattached) are re-billed at the idle rate,
+    # so only a higher idle rate adds cost. Since AWS charges all public IPv4
+    # addresses the same hourly rate, the default rates add nothing; the
+    # surcharge is clipped at zero so a higher fetched rate gives no credit.
+    eip_rate = resources.get("ElasticIP", {}).get("hourly_rate", 0)
+    eip_idle_hours = np.minimum(usage.get("eip_idle_hours", zeros), hours_per_month)
+    eip_idle_surcharge = max(rates["eip_idle_per_hour"] - eip_rate, 0.0)
+    
+    usage_costs = {
+        "VPC": count("NATGateway") * usage.get("nat_processed_gb", zeros) * rates["nat_per_gb"],
+        "ElasticLoadBalancingV2": (
+            count("LoadBalancer") * usage.get("alb_lcu_per_hour", zeros) * hours_per_month * rates["alb_per_lcu_hour"]
+        ),
+        "RDS": count("RDSInstance") * (
+            usage.get("rds_storage_gb", zeros) * rates["rds_storage_per_gb_month"] +
+            usage.get("rds_provisioned_iops", zeros) * rates["rds_iops_per_month"]
+        ),
+        "EC2": count("ElasticIP") * eip_idle_hours * eip_idle_surcharge,
+        "DataTransfer": usage.get("data_transfer_out_gb", zeros) * rates["data_transfer_out_per_gb"]
+    }
+    
+    fixed_costs = cost_analysis["resource_breakdown"]
+    services = list(dict.fromkeys(list(fixed_costs) + list(usage_costs)))
+    
+    # One row of draws per service
+    samples = np.vstack([fixed_costs.get(service, 0.0) + usage_costs.get(service, zeros) for service in services])
+    totals = samples.sum(axis=0)
+    p50, p95 = np.percentile(samples, [50, 95], axis=1)
+    means = samples.mean(axis=1)
+    
+    cost_analysis["resource_breakdown"] = {
+        service: {
+            "fixed": round(float(fixed_costs.get(service, 0.0)), 2),
+            "mean": round(float(means[i]), 2),
+            "p50": round(float(p50[i]), 2),
+            "p95": round(float(p95[i]), 2)
+        }
+        for i, service in enumerate(services)
+    }
+    
+    usage_percentiles = {}
+    for (tier, metric), values in tier_usage.items():
+        low, high = np.percentile(values, [50, 95])
+        usage_percentiles[f"{tier}.{metric}"] = {"p50": round(float(low), 2), "p95": round(float(high), 2)}
+    
+    total_p50, total_p95 = np.percentile(totals, [50, 95])
+    cost_analysis["simulation"] = {
+        "draws": draws,
+        "seed": usage_profile.get("seed"),
+        "rates": rates,
+        "usage_percentiles": usage_percentiles,
+        "monthly_cost_mean": round(float(totals.mean()), 2),
+        "monthly_cost_p50": round(float(total_p50), 2),
+        "monthly_cost_p95": round(float(total_p95), 2)
+    }
     
     return cost_analysis
 
@@ -289,7 +498,26 @@ if __name__ == "__main__":
     parser.add_argument("--template", required=True, help="Path to CloudFormation template")
     parser.add_argument("--output", required=True, help="Output JSON file for cost analysis")
     parser.add_argument("--region", default="eu-west-1", help="AWS region for pricing")
+    parser.add_argument("--simulate", action="store_true", help="Simulate usage-driven charges and report P50/P95 costs")
+    parser.add_argument("--usage-profile", help="JSON usage profile for --simulate (default: built-in profile)")
+    parser.add_argument("--draws", type=int, help="Number of Monte Carlo draws for --simulate")
     
     args = parser.parse_args()
     
-    analyse_cloudformation_costs(args.template, args.output, args.region)
\ No newline at end of file
+    if args.draws and not (args.simulate or args.usage_profile):
+        parser.error("--draws requires --simulate or --usage-profile")
+    
+    usage_profile = None
+    if args.simulate or args.usage_profile:
+        usage_profile = DEFAULT_USAGE_PROFILE
+        if args.usage_profile:
+            with open(args.usage_profile, 'r') as f:
+                usage_profile = json.load(f)
+        if args.draws:
+            usage_profile = {**usage_profile, "draws": args.draws}
+        try:
+            validate_usage_profile(usage_profile)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    analyse_cloudformation_costs(args.template, args.output, args.region, usage_profile)
\ No newline at end of file
@@ -6,8 +6,13 @@ Analyses the complexity of IaC code
 import argparse
 import json
 import os
+import re
+from array import array
 from collections import defaultdict
 
+import numpy as np
+import yaml
+
 
 def load_json_file(filepath, default=None):
     """
@@ -50,24 +55,36 @@ def analyse_complexity(tool, input_dir, output_file):
     # Load graph metrics
     graph_metrics = load_json_file(graph_metrics_file, {})
     
+    # CloudFormation has no graph command, so build the graph from the templates
+    if not graph_metrics and tool == "cloudformation":
+        try:
+            graph_metrics = analyse_cloudformation_graph(input_dir)
+        except Exception as e:
+            print(f"Error building CloudFormation graph: {str(e)}")
+    
     # Prioritise metrics from tool-specific analysis
     resource_count = (
         tool_specific_metrics.get('resources', 0) or 
         tool_specific_metrics.get('resource_count', 0) or 
+        graph_metrics.get('total_resources', 0) or 
         graph_metrics.get('nodes', 0)
     )
     
-    # Analyse resource types
-    try:
-        resource_types = analyse_resource_types(tool, input_dir)
-    except Exception as e:
-        print(f"Error analyzing resource types: {str(e)}")
-        resource_types = {}
+    # Analyse resource types; the CloudFormation graph has already counted them
+    if tool == "cloudformation" and 'resource_types' in graph_metrics:
+        resource_types = graph_metrics['resource_types']
+    else:
+        try:
+            resource_types = analyse_resource_types(tool, input_dir)
+        except Exception as e:
+            print(f"Error analyzing resource types: {str(e)}")
+            resource_types = {}
     
     # Calculate module count (might need adjustment based on your specific requirements)
     module_count = (
         tool_specific_metrics.get('nested_stacks', 0) or 
         tool_specific_metrics.get('module_count', 0) or 
+        graph_metrics.get('nested_stack_count', 0) or 
         len([k for k in resource_types.keys() if 'module' in k.lower()])
     )
     
@@ -87,6 +104,8 @@ def analyse_complexity(tool, input_dir, output_file):
         "graph_nodes": graph_metrics.get('nodes', 0),
         "graph_edges": graph_metrics.get('edges', 0),
         "graph_avg_degree": graph_metrics.get('avg_degree', 0),
+        "graph_longest_chain": graph_metrics.get('longest_chain', 0),
+        "graph_cyclic_components": graph_metrics.get('strongly_connected_components', 0),
         "tool_specific_metrics": tool_specific_metrics
     }
     
@@ -176,47 +195,838 @@ def analyse_resource_types(tool, input_dir):
     
     elif tool == "cloudformation":
         # Process CloudFormation templates
-        import glob
-        import re
+        templates = load_cloudformation_templates(input_dir)
         
-        # For CloudFormation, check templates directory
-        templates_dir = os.path.join(input_dir, "templates")
-        if os.path.exists(templates_dir):
-            input_dir = templates_dir
-            
-        cf_files = []
-        for ext in [".yml", ".yaml", ".json"]:
-            cf_files.extend(glob.glob(os.path.join(input_dir, f"**/*{ext}"), recursive=True))
-        
-        if not cf_files:
+        if not templates:
             print(f"No CloudFormation template files found in {input_dir}")
             return resource_types
         
-        print(f"Found {len(cf_files)} CloudFormation template files")
+        print(f"Found {len(templates)} CloudFormation template files")
         
-        for file_path in cf_files:
+        # Only entries under Resources count; parameter types such as
+        # AWS::EC2::KeyPair::KeyName are not resources
+        for template in templates.values():
+            for resource in (template.get('Resources') or {}).values():
+                if isinstance(resource, dict) and 'Type' in resource:
+                    resource_types[resource['Type']] += 1
+    
+    return resource_types
+
+
+class CloudFormationLoader(yaml.SafeLoader):
+    """YAML loader that expands short-form intrinsics (!Ref, !GetAtt, ...) to their long form"""
+
+
+def construct_intrinsic(loader, tag_suffix, node):
+    """Build the long-form mapping for a short-form intrinsic function tag"""
+    if isinstance(node, yaml.ScalarNode):
+        value = loader.construct_scalar(node)
+    elif isinstance(node, yaml.SequenceNode):
+        value = loader.construct_sequence(node, deep=True)
+    else:
+        value = loader.construct_mapping(node, deep=True)
+    
+    if tag_suffix in ("Ref", "Condition"):
+        return {tag_suffix: value}
+    return {f"Fn::{tag_suffix}": value}
+
+
+CloudFormationLoader.add_multi_constructor("!", construct_intrinsic)
+
+
+def load_cloudformation_templates(input_dir):
+    """
+    Load every CloudFormation template under a directory
+    
+    Args:
+        input_dir (str): CloudFormation directory (or its templates directory)
+    
+    Returns:
+        dict: Parsed template by path relative to the templates directory, in path order
+    """
+    # For CloudFormation, check templates directory
+    templates_dir = os.path.join(input_dir, "templates")
+    if os.path.exists(templates_dir):
+        input_dir = templates_dir
+    
+    templates = {}
+    for root, _, files in os.walk(input_dir):
+        for file in sorted(files):
+            if not file.endswith(('.yml', '.yaml', '.json')):
+                continue
+            file_path = os.path.join(root, file)
             try:
                 with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    # Use regex to extract resource types
-                    type_matches = re.findall(r'Type: (AWS::[a-zA-Z0-9:]+)', content)
-                    for resource_type in type_matches:
-                        resource_types[resource_type] += 1
-                        print(f"Found resource type: {resource_type}")
-                        
+                    template = yaml.load(f, Loader=CloudFormationLoader)
+                if isinstance(template, dict) and 'Resources' in template:
+                    templates[os.path.relpath(file_path, input_dir).replace(os.sep, '/')] = template
             except Exception as e:
                 print(f"Error processing {file_path}: {str(e)}")
     
-    return resource_types
+    return dict(sorted(templates.items()))
+
+
+# ${Name} or ${Name.Attribute} inside Fn::Sub; ${!Literal} is an escape
+SUB_VARIABLE_PATTERN = re.compile(r'\$\{(?!!)([^}]+)\}')
+
+
+def normalise_export_name(value):
+    """Reduce an export/import name to a comparable string, with Sub variables as '*'"""
+    if isinstance(value, dict) and 'Fn::Sub' in value:
+        value = value['Fn::Sub']
+        value = value[0] if isinstance(value, list) else value
+    if not isinstance(value, str):
+        return None
+    return SUB_VARIABLE_PATTERN.sub('*', value)
+
+
+def collect_references(node, references, imports):
+    """
+    Walk a template fragment once, collecting Ref/GetAtt/Sub targets and ImportValue names
+    
+    Args:
+        node: Template fragment
+        references (list): Receives (logical id, attribute or None) tuples
+        imports (list): Receives normalised ImportValue names
+    """
+    if isinstance(node, list):
+        for item in node:
+            collect_references(item, references, imports)
+        return
+    if not isinstance(node, dict):
+        return
+    
+    if len(node) == 1:
+        key, value = next(iter(node.items()))
+        if key == 'Ref' and isinstance(value, str):
+            references.append((value, None))
+            return
+        if key == 'Fn::GetAtt':
+            if isinstance(value, str):
+                value = value.split('.', 1)
+            if isinstance(value, list) and value and isinstance(value[0], str):
+                attribute = value[1] if len(value) > 1 and isinstance(value[1], str) else None
+                references.append((value[0], attribute))
+            return
+        if key == 'Fn::Sub':
+            collect_sub_references(value, references, imports)
+            return
+        if key == 'Fn::ImportValue':
+            name = normalise_export_name(value)
+            if name is not None:
+                imports.append(name)
+            # The import name may itself be built from Refs, e.g. ${NetworkStack}-VpcId
+            collect_references(value, references, imports)
+            return
+    
+    for value in node.values():
+        collect_references(value, references, imports)
+
+
+def collect_sub_references(value, references, imports):
+    """Collect the ${Name} references of a Fn::Sub, skipping its local variables"""
+    template, variables = (value + [{}])[:2] if isinstance(value, list) else (value, {})
+    local = set(variables) if isinstance(variables, dict) else set()
+    if isinstance(template, str):
+        for variable in SUB_VARIABLE_PATTERN.findall(template):
+            name, _, attribute = variable.partition('.')
+            if name not in local:
+                references.append((name, attribute or None))
+    collect_references(variables, references, imports)
+
+
+def nested_template_name(stack_resource, template_names):
+    """Return the local template a nested stack's TemplateURL points to, if any
+
+    The URL must end with the template's relative path; the longest such
+    path wins, so same-named templates in different directories stay apart.
+    """
+    url = (stack_resource.get('Properties') or {}).get('TemplateURL')
+    if isinstance(url, dict) and 'Fn::Sub' in url:
+        url = url['Fn::Sub']
+        url = url[0] if isinstance(url, list) else url
+    elif isinstance(url, dict) and isinstance(url.get('Fn::Join'), list) and len(url['Fn::Join']) == 2:
+        delimiter, parts = url['Fn::Join']
+        url = delimiter.join(part for part in parts if isinstance(part, str))
+    if not isinstance(url, str):
+        return None
+    url = url.rstrip('/')
+    matches = [name for name in template_names if url == name or url.endswith('/' + name)]
+    return max(matches, key=len) if matches else None
+
+
+def build_cloudformation_graph(templates):
+    """
+    Build a dependency graph across CloudFormation templates
+    
+    Nodes are resources, parameters and outputs, named '<stack>/<id>',
+    '<stack>/Parameters/<id>' and '<stack>/Outputs/<id>', where <stack> is the
+    template's relative path. An edge points from
+    the dependent to its dependency, matching `terraform graph`. Edges come
+    from DependsOn, Ref, Fn::GetAtt and Fn::Sub within a template,
+    Fn::ImportValue to the matching Export, and nested-stack wiring: a stack
+    resource depends on the child's parameters, each child parameter on the
+    parent values passed to it, and GetAtt Stack.Outputs.X on the child output.
+    Export names with Sub variables are compared as patterns, so an import
+    that matches several exports is skipped and counted as ambiguous rather
+    than linked to a guess. Each template is walked once.
+    
+    Args:
+        templates (dict): Parsed template by relative path
+    
+    Returns:
+        tuple: (node names list, source index array, target index array, structure counts dict)
+    """
+    graph = GraphBuilder()
+    name_stacks = {}
+    node_stacks = array('q')
+    
+    def node_name(stack, *parts):
+        name = '/'.join((stack,) + parts)
+        name_stacks[name] = stack_ids[stack]
+        return name
+    
+    def intern(name):
+        index = graph.node(name)
+        if index == len(node_stacks):
+            node_stacks.append(name_stacks[name])
+        return index
+    
+    def add_edge(source, target):
+        graph.add_edge(intern(source), intern(target))
+    
+    stack_ids = {stack: i for i, stack in enumerate(templates)}
+    exports = defaultdict(list)
+    pending_imports = []
+    resource_types = defaultdict(int)
+    counts = dict.fromkeys([
+        "template_count", "total_resources", "parameter_count", "output_count",
+        "mapping_count", "condition_count", "nested_stack_count", "ambiguous_imports"
+    ], 0)
+    
+    for stack, template in templates.items():
+        resources = template.get('Resources') or {}
+        parameters = template.get('Parameters') or {}
+        children = {
+            logical_id: child
+            for logical_id, resource in resources.items()
+            if isinstance(resource, dict) and resource.get('Type') == 'AWS::CloudFormation::Stack'
+            for child in [nested_template_name(resource, templates)] if child
+        }
+        
+        counts["template_count"] += 1
+        counts["parameter_count"] += len(parameters)
+        counts["output_count"] += len(template.get('Outputs') or {})
+        counts["mapping_count"] += len(template.get('Mappings') or {})
+        counts["condition_count"] += len(template.get('Conditions') or {})
+        
+        def resolve(name, attribute):
+            """Node a reference in this template points at, or None for pseudo/unknown names"""
+            if name in children and attribute and attribute.startswith('Outputs.'):
+                return node_name(children[name], 'Outputs', attribute[len('Outputs.'):])
+            if name in resources:
+                return node_name(stack, name)
+            if name in parameters:
+                return node_name(stack, 'Parameters', name)
+            return None
+        
+        def link(source, fragment):
+            references, imports = [], []
+            collect_references(fragment, references, imports)
+            for name, attribute in references:
+                target = resolve(name, attribute)
+                if target and target != source:
+                    add_edge(source, target)
+            pending_imports.extend((source, name) for name in imports)
+        
+        for name in parameters:
+            intern(node_name(stack, 'Parameters', name))
+        
+        for logical_id, resource in resources.items():
+            source = node_name(stack, logical_id)
+            intern(source)
+            if not isinstance(resource, dict):
+                continue
+            resource_types[resource.get('Type', 'Unknown')] += 1
+            counts["total_resources"] += 1
+            
+            depends_on = resource.get('DependsOn') or []
+            for dependency in [depends_on] if isinstance(depends_on, str) else depends_on:
+                if dependency in resources:
+                    add_edge(source, node_name(stack, dependency))
+            
+            body = {k: v for k, v in resource.items() if k != 'DependsOn'}
+            if logical_id in children:
+                counts["nested_stack_count"] += 1
+                properties = dict(body.get('Properties') or {})
+                wiring = properties.pop('Parameters', None) or {}
+                body['Properties'] = properties
+                for parameter, value in wiring.items():
+                    child_parameter = node_name(children[logical_id], 'Parameters', parameter)
+                    add_edge(source, child_parameter)
+                    link(child_parameter, value)
+            link(source, body)
+        
+        for name, output in (template.get('Outputs') or {}).items():
+            source = node_name(stack, 'Outputs', name)
+            intern(source)
+            if not isinstance(output, dict):
+                continue
+            link(source, output.get('Value'))
+            export_name = normalise_export_name((output.get('Export') or {}).get('Name'))
+            if export_name is not None:
+                exports[export_name].append(source)
+    
+    for source, name in pending_imports:
+        candidates = exports.get(name, [])
+        if len(candidates) == 1:
+            add_edge(source, candidates[0])
+        elif candidates:
+            counts["ambiguous_imports"] += 1
+    
+    node_names, sources, targets = graph.arrays()
+    stack_of = np.frombuffer(node_stacks, dtype=np.int64)
+    counts["cross_stack_edges"] = int(np.count_nonzero(stack_of[sources] != stack_of[targets]))
+    counts["unique_resource_types"] = len(resource_types)
+    counts["resource_types"] = dict(resource_types)
+    
+    return node_names, sources, targets, counts
+
+
+class GraphBuilder:
+    """Interns node names and accumulates edges as int64 index arrays"""
+
+    def __init__(self):
+        self.node_index = {}
+        self.node_names = []
+        self.sources = array('q')
+        self.targets = array('q')
+
+    def node(self, name):
+        """Return the index of a node, adding it on first sight"""
+        index = self.node_index.get(name)
+        if index is None:
+            index = len(self.node_names)
+            self.node_index[name] = index
+            self.node_names.append(name)
+        return index
+
+    def add_edge(self, source, target):
+        """Record an edge between two node indices"""
+        self.sources.append(source)
+        self.targets.append(target)
+
+    def arrays(self):
+        """Return (node names list, source index array, target index array)"""
+        return (
+            self.node_names,
+            np.frombuffer(self.sources, dtype=np.int64),
+            np.frombuffer(self.targets, dtype=np.int64),
+        )
+
+
+# Tokens in a DOT stream: quoted IDs, edge operators, punctuation, bare IDs.
+# Comments are matched as tokens so they can be dropped without touching
+# quoted strings that happen to contain '//' or '#'. Bare IDs follow DOT's
+# alphanumeric and numeral forms, so 'a->b' splits into three tokens.
+DOT_TOKEN_PATTERN = re.compile(
+    r'\s*(?:'
+    r'(?P<quoted>"(?:[^"\\]|\\.)*")'
+    r'|(?P<comment>//.*|#.*)'
+    r'|(?P<block>/\*)'
+    r'|(?P<edge>->|--)'
+    r'|(?P<punct>[\[\]{};=,:])'
+    r'|(?P<id>[A-Za-z_\u0080-\uffff][A-Za-z0-9_\u0080-\uffff]*|-?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?))'
+    r'|(?P<other>\S)'
+    r')'
+)
+
+DOT_KEYWORDS = {"strict", "graph", "digraph", "subgraph", "node", "edge"}
+
+
+def iter_dot_tokens(lines):
+    """
+    Stream tokens from DOT source one line at a time
+
+    Args:
+        lines (iterable): Lines of DOT source
+
+    Yields:
+        tuple: (kind, value) where kind is 'id', 'quoted', 'edge' or 'punct'
+    """
+    in_block_comment = False
+    for line in lines:
+        pos = 0
+        if in_block_comment:
+            end = line.find('*/')
+            if end == -1:
+                continue
+            pos = end + 2
+            in_block_comment = False
+
+        while pos < len(line):
+            match = DOT_TOKEN_PATTERN.match(line, pos)
+            if not match or match.end() == pos:
+                break
+            pos = match.end()
+            kind = match.lastgroup
+
+            if kind == 'comment':
+                break
+            if kind == 'block':
+                end = line.find('*/', pos)
+                if end == -1:
+                    in_block_comment = True
+                    break
+                pos = end + 2
+            elif kind == 'quoted':
+                yield kind, match.group(kind)[1:-1].replace('\\"', '"')
+            elif kind != 'other':
+                yield kind, match.group(kind)
+
+
+def parse_dot_lines(lines):
+    """
+    Parse DOT source into edge arrays
+
+    Attribute lists, graph-level assignments, keywords and ports are
+    skipped so only real nodes and edges are recorded. Edge chains
+    (a -> b -> c) are expanded into individual edges, and a subgraph used
+    as an edge operand (a -> {b c}, {a b} -> c) stands for all its nodes.
+
+    Args:
+        lines (iterable): Lines of DOT source
+
+    Returns:
+        tuple: (node names list, source index array, target index array)
+    """
+    graph = GraphBuilder()
+    scopes = []           # Open braces: nodes seen inside and the edge operand waiting on them
+
+    def add_node(name):
+        index = graph.node(name)
+        if scopes:
+            scopes[-1]["members"].append(index)
+        return index
+
+    def connect(sources, targets):
+        for source in sources:
+            for target in targets:
+                graph.add_edge(source, target)
+
+    attr_depth = 0
+    pending = None        # ID whose role depends on the next token
+    edge_from = None      # Left-hand operand of an open edge operator
+    tail = None           # Operand just completed, which may start an edge
+    skip_next_id = False  # Next ID is a graph/subgraph name, port or assigned value
+
+    for kind, value in iter_dot_tokens(lines):
+        if attr_depth:
+            if value == '[':
+                attr_depth += 1
+            elif value == ']':
+                attr_depth -= 1
+            continue
+
+        if kind in ('id', 'quoted'):
+            if skip_next_id:
+                skip_next_id = False
+                continue
+            keyword = value.lower() if kind == 'id' else None
+            if keyword in DOT_KEYWORDS:
+                if pending is not None:
+                    add_node(pending)
+                    pending = None
+                tail = None
+                # 'subgraph' may open an edge operand; its name is skipped either way
+                skip_next_id = keyword in {"graph", "digraph", "subgraph"}
+                if keyword != "subgraph":
+                    edge_from = None
+                continue
+            if edge_from is not None:
+                target = add_node(value)
+                connect(edge_from, [target])
+                edge_from = None
+                tail = [target]
+                continue
+            if pending is not None:
+                add_node(pending)
+            pending = value
+            tail = None
+            continue
+
+        if kind == 'edge':
+            if pending is not None:
+                tail = [add_node(pending)]
+                pending = None
+            edge_from = tail
+            tail = None
+            continue
+
+        # Punctuation
+        if value == '=':
+            # Graph-level assignment: drop the key and its value
+            pending = None
+            skip_next_id = True
+            continue
+        if value == ':':
+            # Port suffix (node:port): keep the node, drop the port
+            skip_next_id = True
+            continue
+
+        if pending is not None:
+            add_node(pending)
+            pending = None
+        skip_next_id = False
+
+        if value == '{':
+            scopes.append({"members": [], "edge_from": edge_from})
+            tail = None
+        elif value == '}' and scopes:
+            scope = scopes.pop()
+            if scope["edge_from"]:
+                connect(scope["edge_from"], scope["members"])
+            if scopes:
+                scopes[-1]["members"].extend(scope["members"])
+            tail = scope["members"]
+        else:
+            if value == '[':
+                attr_depth = 1
+            tail = None
+        edge_from = None
+
+    if pending is not None:
+        add_node(pending)
+
+    return graph.arrays()
+
+
+def parse_dot_graph(dot_file):
+    """
+    Parse a DOT file (e.g. `terraform graph` output) into edge arrays
+
+    Args:
+        dot_file (str): Path to DOT file
+
+    Returns:
+        tuple: (node names list, source index array, target index array)
+    """
+    with open(dot_file, 'r', encoding='utf-8', errors='ignore') as f:
+        return parse_dot_lines(f)
+
+
+def build_csr(node_count, sources, targets):
+    """
+    Build a compressed sparse row adjacency structure from edge arrays
+
+    Args:
+        node_count (int): Number of nodes
+        sources (ndarray): Edge source indices
+        targets (ndarray): Edge target indices
+
+    Returns:
+        tuple: (indptr, indices) where row i's neighbours are indices[indptr[i]:indptr[i+1]]
+    """
+    order = np.argsort(sources, kind='stable')
+    indices = targets[order]
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+    return indptr, indices
+
+
+def gather_neighbours(indptr, indices, rows):
+    """Return the concatenated CSR neighbour lists of the given rows"""
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=indices.dtype)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+    return indices[offsets]
+
+
+def topological_levels(node_count, indptr, indices):
+    """
+    Assign each node its depth from the graph sources with a
+    level-synchronous Kahn traversal over the CSR arrays
+
+    Nodes that sit on, or downstream of, a cycle are never released and
+    keep level -1.
+
+    Returns:
+        ndarray: Level per node
+    """
+    in_degree = np.bincount(indices, minlength=node_count)
+    levels = np.full(node_count, -1, dtype=np.int64)
+    frontier = np.flatnonzero(in_degree == 0)
+    depth = 0
+
+    while frontier.size:
+        levels[frontier] = depth
+        released = gather_neighbours(indptr, indices, frontier)
+        in_degree -= np.bincount(released, minlength=node_count)
+        candidates = np.unique(released)
+        frontier = candidates[in_degree[candidates] == 0]
+        depth += 1
+
+    return levels
+
+
+def strongly_connected_components(node_count, indptr, indices, candidates):
+    """
+    Label strongly connected components among candidate nodes with an
+    iterative Tarjan traversal restricted to the candidate set
+
+    Returns:
+        ndarray: Component label per node (-1 for nodes outside candidates)
+    """
+    labels = np.full(node_count, -1, dtype=np.int64)
+    if not candidates.size:
+        return labels
+
+    allowed = np.zeros(node_count, dtype=bool)
+    allowed[candidates] = True
+    index = np.full(node_count, -1, dtype=np.int64)
+    lowlink = np.zeros(node_count, dtype=np.int64)
+    on_stack = np.zeros(node_count, dtype=bool)
+    indptr_list = indptr.tolist()
+    indices_list = indices.tolist()
+    stack = []
+    counter = 0
+    component = 0
+
+    for root in candidates.tolist():
+        if index[root] != -1:
+            continue
+        work = [(root, indptr_list[root])]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+
+        while work:
+            node, cursor = work[-1]
+            end = indptr_list[node + 1]
+            while cursor < end:
+                neighbour = indices_list[cursor]
+                cursor += 1
+                if not allowed[neighbour]:
+                    continue
+                if index[neighbour] == -1:
+                    work[-1] = (node, cursor)
+                    index[neighbour] = lowlink[neighbour] = counter
+                    counter += 1
+                    stack.append(neighbour)
+                    on_stack[neighbour] = True
+                    work.append((neighbour, indptr_list[neighbour]))
+                    break
+                if on_stack[neighbour]:
+                    lowlink[node] = min(lowlink[node], index[neighbour])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        labels[member] = component
+                        if member == node:
+                            break
+                    component += 1
+
+    return labels
+
+
+def analyse_dependency_graph(node_names, sources, targets, hotspot_count=10):
+    """
+    Compute graph metrics for a dependency graph held as edge arrays
+
+    Args:
+        node_names (list): Node name per index
+        sources (ndarray): Edge source indices
+        targets (ndarray): Edge target indices
+        hotspot_count (int): Number of fan-in hotspots to report
+
+    Returns:
+        dict: Graph metrics
+    """
+    node_count = len(node_names)
+    if node_count == 0:
+        return {
+            "nodes": 0,
+            "edges": 0,
+            "avg_degree": 0,
+            "max_in_degree": 0,
+            "max_out_degree": 0,
+            "degree_distribution": {},
+            "longest_chain": 0,
+            "strongly_connected_components": 0,
+            "largest_scc": 0,
+            "cyclic_nodes": 0,
+            "fan_in_hotspots": [],
+            "complexity_score": 0.0
+        }
+
+    # Collapse duplicate edges, as a simple directed graph would
+    if sources.size:
+        keys = np.unique(sources.astype(np.int64) * node_count + targets)
+        sources, targets = keys // node_count, keys % node_count
+    edge_count = int(sources.size)
+
+    indptr, indices = build_csr(node_count, sources, targets)
+    reverse_indptr, reverse_indices = build_csr(node_count, targets, sources)
+
+    out_degree = np.diff(indptr)
+    in_degree = np.diff(reverse_indptr)
+    degree = in_degree + out_degree
+    avg_degree = float(degree.sum()) / node_count
+
+    distribution = np.bincount(degree)
+    degree_distribution = {
+        str(d): int(c) for d, c in zip(np.flatnonzero(distribution), distribution[distribution > 0])
+    }
+
+    # Peel acyclic nodes from both ends; whatever survives is on or between cycles
+    forward = topological_levels(node_count, indptr, indices)
+    backward = topological_levels(node_count, reverse_indptr, reverse_indices)
+    residual = np.flatnonzero((forward == -1) & (backward == -1))
+    scc_labels = strongly_connected_components(node_count, indptr, indices, residual)
+
+    # Component id per node: trivial nodes keep their own id
+    components = np.arange(node_count, dtype=np.int64)
+    cyclic = scc_labels >= 0
+    components[cyclic] = node_count + scc_labels[cyclic]
+    _, components = np.unique(components, return_inverse=True)
+    components = components.ravel()
+
+    # A component is a real cycle if it has several members or a self-loop
+    scc_sizes = np.bincount(scc_labels[cyclic]) if cyclic.any() else np.zeros(0, dtype=np.int64)
+    is_cycle = scc_sizes > 1
+    self_loops = sources[sources == targets]
+    if self_loops.size:
+        is_cycle[scc_labels[self_loops]] = True
+
+    # Longest dependency chain over the condensation, which is always acyclic
+    condensed_count = int(components.max()) + 1
+    c_sources, c_targets = components[sources], components[targets]
+    keep = c_sources != c_targets
+    if keep.any():
+        c_keys = np.unique(c_sources[keep] * condensed_count + c_targets[keep])
+        c_indptr, c_indices = build_csr(condensed_count, c_keys // condensed_count, c_keys % condensed_count)
+        longest_chain = int(topological_levels(condensed_count, c_indptr, c_indices).max()) + 1
+    else:
+        longest_chain = 1
+
+    top = min(hotspot_count, node_count)
+    hotspot_rows = np.argpartition(-in_degree, top - 1)[:top]
+    hotspot_rows = hotspot_rows[np.argsort(-in_degree[hotspot_rows], kind='stable')]
+    fan_in_hotspots = [
+        {"node": node_names[row], "fan_in": int(in_degree[row])}
+        for row in hotspot_rows.tolist() if in_degree[row] > 0
+    ]
+
+    # Calculate complexity score based on graph properties
+    complexity = (node_count * 0.4) + (edge_count * 0.6) + (avg_degree * 5)
+
+    return {
+        "nodes": node_count,
+        "edges": edge_count,
+        "avg_degree": round(avg_degree, 2),
+        "max_in_degree": int(in_degree.max()),
+        "max_out_degree": int(out_degree.max()),
+        "degree_distribution": degree_distribution,
+        "longest_chain": longest_chain,
+        "strongly_connected_components": int(is_cycle.sum()),
+        "largest_scc": int(scc_sizes.max()) if scc_sizes.size else 1,
+        "cyclic_nodes": int(is_cycle[scc_labels[cyclic]].sum()),
+        "fan_in_hotspots": fan_in_hotspots,
+        "complexity_score": round(complexity, 2)
+    }
+
+
+def analyse_graph(dot_file, output_file):
+    """
+    Analyses a `terraform graph` / `tofu graph` DOT file
+
+    Args:
+        dot_file (str): Path to DOT file
+        output_file (str): Where to save the graph metrics
+    """
+    node_names, sources, targets = parse_dot_graph(dot_file)
+    result = analyse_dependency_graph(node_names, sources, targets)
+
+    try:
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        with open(output_file, 'w') as f:
+            json.dump(result, f, indent=2)
+    except Exception as e:
+        print(f"Error saving graph metrics: {str(e)}")
+
+    print(f"Nodes: {result['nodes']}")
+    print(f"Edges: {result['edges']}")
+    print(f"Avg Degree: {result['avg_degree']}")
+    print(f"Longest Chain: {result['longest_chain']}")
+    print(f"Cyclic Components: {result['strongly_connected_components']}")
+    print(f"Complexity Score: {result['complexity_score']}")
+
+    return result
+
+
+def analyse_cloudformation_graph(input_dir, output_file=None):
+    """
+    Analyses the dependency graph of CloudFormation templates, producing the
+    same graph metrics as the Terraform/OpenTofu path plus structure counts
+    
+    Args:
+        input_dir (str): CloudFormation directory (or its templates directory)
+        output_file (str, optional): Where to save the graph metrics
+    """
+    templates = load_cloudformation_templates(input_dir)
+    node_names, sources, targets, structure = build_cloudformation_graph(templates)
+    result = analyse_dependency_graph(node_names, sources, targets)
+    result.update(structure)
+    
+    if output_file:
+        try:
+            os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+            with open(output_file, 'w') as f:
+                json.dump(result, f, indent=2)
+        except Exception as e:
+            print(f"Error saving graph metrics: {str(e)}")
+    
+    print(f"Templates: {result.get('template_count', 0)}")
+    print(f"Resources: {result.get('total_resources', 0)}")
+    print(f"Nested Stacks: {result.get('nested_stack_count', 0)}")
+    print(f"Nodes: {result['nodes']}")
+    print(f"Edges: {result['edges']} ({result.get('cross_stack_edges', 0)} cross-stack)")
+    if result.get('ambiguous_imports'):
+        print(f"Ambiguous Imports: {result['ambiguous_imports']} (matched several exports, not linked)")
+    print(f"Longest Chain: {result['longest_chain']}")
+    print(f"Complexity Score: {result['complexity_score']}")
+    
+    return result
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Analyse IaC code complexity")
     parser.add_argument("--tool", required=True, help="IaC tool (terraform, cloudformation, opentofu)")
-    parser.add_argument("--input-dir", required=True, help="Directory containing IaC code")
+    parser.add_argument("--input-dir", help="Directory containing IaC code")
+    parser.add_argument("--graph-dot", help="DOT file from terraform/tofu graph to analyse instead of the IaC code")
+    parser.add_argument("--graph", action="store_true", help="Write CloudFormation dependency graph metrics for --input-dir")
     parser.add_argument("--output", required=True, help="Output JSON file for complexity report")
     
     args = parser.parse_args()
     
-    analyse_complexity(args.tool, args.input_dir, args.output)
\ No newline at end of file
+    if args.graph and (args.tool != "cloudformation" or not args.input_dir):
+        parser.error("--graph requires --tool cloudformation and --input-dir; use --graph-dot for terraform/opentofu")
+    
+    if args.graph_dot:
+        analyse_graph(args.graph_dot, args.output)
+    elif args.graph:
+        analyse_cloudformation_graph(args.input_dir, args.output)
+    elif args.input_dir:
+        analyse_complexity(args.tool, args.input_dir, args.output)
+    else:
+        parser.error("one of --input-dir or --graph-dot is required")
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Aggregates the complexity, cost, deployment, teardown and security
+reports of an evaluation run into a single cross-tool comparison report
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+
+TOOLS = ["cloudformation", "opentofu", "terraform"]
+
+# Artifact kind by filename suffix; anything else in the run is ignored
+ARTIFACT_PATTERNS = [
+    ("complexity", re.compile(r'final_report\.json$')),
+    ("cost", re.compile(r'(infracost|cost_analysis)\.json$')),
+    ("security", re.compile(r'security_report\.json$')),
+    ("checkov", re.compile(r'checkov_results\.json$')),
+    ("deployment", re.compile(r'deployment_report\.json$')),
+    ("teardown", re.compile(r'teardown_report\.json$')),
+]
+
+# Comparison metrics: (section, metric, True if lower values are better)
+COMPARISON_METRICS = [
+    ("complexity", "complexity_score", True),
+    ("cost", "monthly_cost", True),
+    ("cost", "cost_per_resource", True),
+    ("security", "pass_percentage", False),
+    ("deployment", "deploy_time_seconds", True),
+    ("teardown", "teardown_time_seconds", True),
+]
+
+CACHE_VERSION = 2
+
+
+def hash_file(filepath, chunk_size=1 << 20):
+    """
+    Compute the SHA-256 digest of a file without loading it whole
+
+    Args:
+        filepath (str): Path to file
+        chunk_size (int): Bytes read per chunk
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def detect_tool(relative_path):
+    """Return the IaC tool named in an artifact path, if any"""
+    path = relative_path.lower()
+    for tool in TOOLS:
+        if tool in path:
+            return tool
+    return None
+
+
+def discover_artifacts(results_dir):
+    """
+    Find all report artifacts for a run
+
+    Args:
+        results_dir (str): Root directory holding the downloaded artifacts
+
+    Returns:
+        list: Artifact dicts with path, relative path, kind and tool
+    """
+    artifacts = []
+    for root, _, files in os.walk(results_dir):
+        for file in sorted(files):
+            kind = next((k for k, pattern in ARTIFACT_PATTERNS if pattern.search(file)), None)
+            if kind is None:
+                continue
+            path = os.path.join(root, file)
+            relative_path = os.path.relpath(path, results_dir)
+            tool = detect_tool(relative_path)
+            if tool is None:
+                print(f"Skipping {relative_path}: cannot tell which tool it belongs to")
+                continue
+            artifacts.append({
+                "path": path,
+                "relative_path": relative_path,
+                "kind": kind,
+                "tool": tool
+            })
+    return sorted(artifacts, key=lambda a: a["relative_path"])
+
+
+def extract_complexity(data):
+    """Derive complexity metrics from a final complexity report"""
+    return {
+        "complexity_score": data.get('complexity_score', data.get('raw_complexity_score', 0)),
+        "normalised_complexity_score": data.get('normalised_complexity_score'),
+        "resource_count": data.get('resource_count', 0),
+        "module_count": data.get('module_count', 0),
+        "resource_type_count": data.get('resource_type_count', 0)
+    }
+
+
+def extract_cost(data):
+    """Derive cost metrics from an Infracost breakdown or CloudFormation cost analysis"""
+    if 'totalMonthlyCost' in data:
+        monthly_cost = float(data.get('totalMonthlyCost') or 0)
+        resource_count = data.get('summary', {}).get('totalDetectedResources', 0)
+    else:
+        monthly_cost = float(data.get('monthly_cost_estimate', 0))
+        resource_count = sum(r.get('count', 1) for r in data.get('resources', {}).values())
+
+    metrics = {
+        "monthly_cost": round(monthly_cost, 2),
+        "costed_resources": resource_count,
+        "cost_per_resource": round(monthly_cost / resource_count, 2) if resource_count else 0
+    }
+
+    # Usage-driven estimates from cloudformation_cost_analyser --simulate
+    simulation = data.get('simulation')
+    if simulation:
+        metrics["monthly_cost_p50"] = simulation.get('monthly_cost_p50')
+        metrics["monthly_cost_p95"] = simulation.get('monthly_cost_p95')
+
+    return metrics
+
+
+def extract_security(data):
+    """Derive security metrics from a security_analyser report"""
+    summary = data.get('summary', {})
+    return {
+        "pass_percentage": data.get('security_assessment', {}).get('pass_percentage', 0),
+        "passed_checks": summary.get('passed_checks', 0),
+        "failed_checks": summary.get('failed_checks', 0)
+    }
+
+
+def extract_checkov(data):
+    """Derive security metrics from raw Checkov results (one or more frameworks)"""
+    runs = data if isinstance(data, list) else [data]
+    passed = sum(run.get('summary', {}).get('passed', 0) for run in runs)
+    failed = sum(run.get('summary', {}).get('failed', 0) for run in runs)
+    total_checks = passed + failed
+    return {
+        "pass_percentage": round(100 * passed / total_checks, 2) if total_checks > 0 else 0,
+        "passed_checks": passed,
+        "failed_checks": failed
+    }
+
+
+def extract_deployment(data):
+    """Derive timing metrics from a deployment report"""
+    return {
+        "deploy_time_seconds": data.get('total_time_seconds', data.get('deploy_time_seconds', 0)),
+        "success": data.get('success', False)
+    }
+
+
+def extract_teardown(data):
+    """Derive timing metrics from a teardown report"""
+    return {
+        "teardown_time_seconds": data.get(
+            'overall_teardown_time_seconds',
+            data.get('total_time_seconds', data.get('destroy_time_seconds', 0))
+        ),
+        "success": data.get('success', False)
+    }
+
+
+EXTRACTORS = {
+    "complexity": extract_complexity,
+    "cost": extract_cost,
+    "security": extract_security,
+    "checkov": extract_checkov,
+    "deployment": extract_deployment,
+    "teardown": extract_teardown,
+}
+
+
+def load_artifact_metrics(path, kind):
+    """
+    Load one artifact and derive its metrics
+
+    Runs in a worker process, so only the small metrics dict travels back
+    rather than the parsed (possibly very large) JSON document.
+
+    Args:
+        path (str): Path to artifact
+        kind (str): Artifact kind from ARTIFACT_PATTERNS
+
+    Returns:
+        dict: Derived metrics, or None if the artifact could not be read
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return EXTRACTORS[kind](data)
+    except Exception as e:
+        print(f"Error loading {path}: {str(e)}")
+        return None
+
+
+def load_cache(cache_file):
+    """Load the metrics cache, discarding it if it was written by another version"""
+    try:
+        if os.path.exists(cache_file):
+            with open(cache_file, 'r') as f:
+                cache = json.load(f)
+            if cache.get('version') == CACHE_VERSION:
+                return cache.get('artifacts', {})
+    except Exception as e:
+        print(f"Error loading cache {cache_file}: {str(e)}")
+    return {}
+
+
+def save_cache(cache_file, entries):
+    """Persist the metrics cache"""
+    try:
+        os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+        with open(cache_file, 'w') as f:
+            json.dump({"version": CACHE_VERSION, "artifacts": entries}, f, indent=2)
+    except Exception as e:
+        print(f"Error saving cache {cache_file}: {str(e)}")
+
+
+def collect_metrics(artifacts, cache, workers=None):
+    """
+    Resolve metrics for every artifact, reusing cached entries whose
+    file hash is unchanged and loading the rest concurrently
+
+    Args:
+        artifacts (list): Artifacts from discover_artifacts
+        cache (dict): Cache entries keyed by SHA-256 digest
+        workers (int, optional): Worker processes for loading artifacts
+
+    Returns:
+        tuple: (artifacts annotated with sha256/metrics/cached, new cache entries)
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = list(pool.map(lambda a: hash_file(a["path"]), artifacts))
+
+    stale = []
+    for artifact, digest in zip(artifacts, digests):
+        artifact["sha256"] = digest
+        entry = cache.get(digest)
+        if entry and entry.get("kind") == artifact["kind"]:
+            artifact["metrics"] = entry["metrics"]
+            artifact["cached"] = True
+        else:
+            stale.append(artifact)
+
+    if stale:
+        if workers == 1 or len(stale) == 1:
+            results = [load_artifact_metrics(a["path"], a["kind"]) for a in stale]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(
+                    load_artifact_metrics,
+                    [a["path"] for a in stale],
+                    [a["kind"] for a in stale]
+                ))
+        for artifact, metrics in zip(stale, results):
+            artifact["metrics"] = metrics
+            artifact["cached"] = False
+
+    entries = {
+        a["sha256"]: {"kind": a["kind"], "metrics": a["metrics"]}
+        for a in artifacts if a["metrics"] is not None
+    }
+    return artifacts, entries
+
+
+def build_comparison(artifacts):
+    """
+    Merge artifact metrics per tool and rank the tools on each metric
+
+    Raw Checkov results are merged after security reports so the figures
+    recomputed from the raw data win when both are present. Cost per
+    resource is taken over the complexity report's resource count when one
+    exists, so every tool is divided by the same kind of count.
+
+    Args:
+        artifacts (list): Artifacts annotated by collect_metrics
+
+    Returns:
+        tuple: (per-tool metrics, comparison table)
+    """
+    order = [kind for kind, _ in ARTIFACT_PATTERNS]
+    tools = {}
+    for artifact in sorted(artifacts, key=lambda a: order.index(a["kind"])):
+        if artifact["metrics"] is None:
+            continue
+        section = "security" if artifact["kind"] == "checkov" else artifact["kind"]
+        tool_metrics = tools.setdefault(artifact["tool"], {})
+        tool_metrics.setdefault(section, {}).update(artifact["metrics"])
+
+    for tool_metrics in tools.values():
+        cost = tool_metrics.get("cost")
+        resource_count = tool_metrics.get("complexity", {}).get("resource_count")
+        if cost and resource_count:
+            cost["cost_per_resource"] = round(cost["monthly_cost"] / resource_count, 2)
+
+    comparison = {}
+    for section, metric, lower_is_better in COMPARISON_METRICS:
+        values = {
+            tool: tool_metrics[section][metric]
+            for tool, tool_metrics in sorted(tools.items())
+            if tool_metrics.get(section, {}).get(metric) is not None
+        }
+        if not values:
+            continue
+        pick = min if lower_is_better else max
+        comparison[metric] = {
+            "values": values,
+            "best": pick(values, key=values.get),
+            "lower_is_better": lower_is_better
+        }
+
+    return tools, comparison
+
+
+def aggregate_evaluation(results_dir, output_file, cache_file=None, workers=None):
+    """
+    Build the consolidated comparison report for an evaluation run
+
+    Args:
+        results_dir (str): Root directory holding the run's report artifacts
+        output_file (str): Where to save the comparison report
+        cache_file (str, optional): Metrics cache location
+        workers (int, optional): Worker processes for loading artifacts
+    """
+    cache_file = cache_file or os.path.join(os.path.dirname(output_file) or ".", ".aggregator_cache.json")
+
+    artifacts = discover_artifacts(results_dir)
+    print(f"Found {len(artifacts)} report artifacts in {results_dir}")
+
+    artifacts, entries = collect_metrics(artifacts, load_cache(cache_file), workers)
+    save_cache(cache_file, entries)
+
+    tools, comparison = build_comparison(artifacts)
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "tools": tools,
+        "comparison": comparison,
+        "artifacts": [
+            {
+                "path": a["relative_path"],
+                "kind": a["kind"],
+                "tool": a["tool"],
+                "sha256": a["sha256"]
+            }
+            for a in artifacts
+        ]
+    }
+
+    try:
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        with open(output_file, 'w') as f:
+            json.dump(report, f, indent=2)
+    except Exception as e:
+        print(f"Error saving comparison report: {str(e)}")
+
+    reloaded = sum(1 for a in artifacts if not a["cached"])
+    print(f"Comparison report generated ({reloaded} artifacts loaded, {len(artifacts) - reloaded} from cache)")
+    for metric, row in comparison.items():
+        values = ", ".join(f"{tool}={value}" for tool, value in row["values"].items())
+        print(f"  {metric}: {values} (best: {row['best']})")
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate IaC evaluation reports into a comparison report")
+    parser.add_argument("--results-dir", required=True, help="Directory containing the run's report artifacts")
+    parser.add_argument("--output", required=True, help="Output JSON file for the comparison report")
+    parser.add_argument("--cache", help="Metrics cache file (default: next to the output)")
+    parser.add_argument("--workers", type=int, help="Worker processes for loading artifacts")
+
+    args = parser.parse_args()
+
+    aggregate_evaluation(args.results_dir, args.output, args.cache, args.workers)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The analysers are standalone scripts, not an installed package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scripts", "analysers"))
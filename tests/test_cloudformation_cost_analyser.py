@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from cloudformation_cost_analyser import sample_usage, simulate_usage_costs, validate_usage_profile
+
+
+def base_analysis(eip_rate=0.005):
+    return {
+        "resources": {
+            "NATGateway": {"count": 2, "hourly_rate": 0.045},
+            "ElasticIP": {"count": 2, "hourly_rate": eip_rate},
+        },
+        "monthly_cost_estimate": 80.0,
+        "resource_breakdown": {"VPC": 65.7, "EC2": 7.3},
+    }
+
+
+def fixed(value):
+    return {"distribution": "fixed", "value": value}
+
+
+def test_metric_in_several_tiers_is_summed():
+    profile = {"draws": 100, "seed": 1, "tiers": {
+        "presentation": {"data_transfer_out_gb": fixed(10)},
+        "application": {"data_transfer_out_gb": fixed(20)},
+    }}
+    result = simulate_usage_costs(base_analysis(), profile)
+    assert result["resource_breakdown"]["DataTransfer"]["p50"] == pytest.approx(30 * 0.09)
+    assert set(result["simulation"]["usage_percentiles"]) == {
+        "presentation.data_transfer_out_gb", "application.data_transfer_out_gb"
+    }
+
+
+def test_usage_is_added_to_fixed_costs_per_service():
+    profile = {"draws": 5000, "seed": 7, "tiers": {
+        "application": {"nat_processed_gb": {"distribution": "lognormal", "median": 30, "sigma": 0.8}},
+    }}
+    vpc = simulate_usage_costs(base_analysis(), profile)["resource_breakdown"]["VPC"]
+    assert vpc["fixed"] == 65.7
+    assert vpc["p50"] == pytest.approx(65.7 + 2 * 30 * 0.048, rel=0.05)
+    assert vpc["p95"] > vpc["p50"]
+
+
+def test_eip_idle_surcharge_is_never_negative():
+    profile = {"draws": 10, "seed": 1, "tiers": {"application": {"eip_idle_hours": fixed(100)}}}
+    result = simulate_usage_costs(base_analysis(eip_rate=0.01), profile)
+    assert result["resource_breakdown"]["EC2"]["p50"] == 7.3
+
+
+def test_eip_idle_hours_billed_at_higher_idle_rate():
+    profile = {"draws": 10, "seed": 1, "rates": {"eip_idle_per_hour": 0.01},
+               "tiers": {"application": {"eip_idle_hours": fixed(100)}}}
+    result = simulate_usage_costs(base_analysis(eip_rate=0.005), profile)
+    assert result["resource_breakdown"]["EC2"]["p50"] == pytest.approx(7.3 + 2 * 100 * 0.005)
+
+
+def test_sample_usage_is_non_negative_and_rejects_unknown():
+    rng = np.random.default_rng(0)
+    samples = sample_usage({"distribution": "normal", "mean": 0, "std": 5}, 1000, rng)
+    assert samples.min() >= 0
+    with pytest.raises(ValueError):
+        sample_usage({"distribution": "poisson"}, 10, rng)
+
+
+def test_malformed_profile_names_tier_metric_and_parameter():
+    profile = {"tiers": {"data": {"rds_storage_gb": {"distribution": "lognormal", "mean": 50, "sigma": 0.3}}}}
+    with pytest.raises(ValueError, match=r"data\.rds_storage_gb: lognormal distribution is missing 'median'"):
+        validate_usage_profile(profile)
+    with pytest.raises(ValueError, match="data.rds_storage_gb"):
+        simulate_usage_costs(base_analysis(), profile)
+    with pytest.raises(ValueError, match="missing 'median'"):
+        sample_usage(profile["tiers"]["data"]["rds_storage_gb"], 10, np.random.default_rng(0))
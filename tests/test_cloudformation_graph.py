@@ -0,0 +1,193 @@
+import os
+import runpy
+import sys
+
+import pytest
+
+from complexity_analyser import (
+    analyse_complexity,
+    build_cloudformation_graph,
+    load_cloudformation_templates,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CFN_DIR = os.path.join(REPO_ROOT, "infrastructure", "cloudformation")
+ANALYSER = os.path.join(REPO_ROOT, "scripts", "analysers", "complexity_analyser.py")
+
+
+def edges(templates):
+    names, sources, targets, counts = build_cloudformation_graph(templates)
+    return {(names[s], names[t]) for s, t in zip(sources, targets)}, counts
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_nested_stack_wiring_and_outputs():
+    templates = {
+        "main.yml": {
+            "Resources": {
+                "Net": {
+                    "Type": "AWS::CloudFormation::Stack",
+                    "Properties": {"TemplateURL": {"Fn::Sub": "https://${Bucket}/cfn/net.yml"}},
+                },
+                "App": {
+                    "Type": "AWS::CloudFormation::Stack",
+                    "Properties": {
+                        "TemplateURL": "https://bucket/cfn/app.yml",
+                        "Parameters": {"VpcId": {"Fn::GetAtt": ["Net", "Outputs.VpcId"]}},
+                    },
+                },
+            }
+        },
+        "net.yml": {
+            "Resources": {"Vpc": {"Type": "AWS::EC2::VPC"}},
+            "Outputs": {"VpcId": {"Value": {"Ref": "Vpc"}}},
+        },
+        "app.yml": {
+            "Parameters": {"VpcId": {"Type": "String"}},
+            "Resources": {
+                "Sg": {"Type": "AWS::EC2::SecurityGroup", "Properties": {"VpcId": {"Ref": "VpcId"}}},
+            },
+        },
+    }
+    found, counts = edges(templates)
+    assert ("main.yml/App", "app.yml/Parameters/VpcId") in found
+    assert ("app.yml/Parameters/VpcId", "net.yml/Outputs/VpcId") in found
+    assert ("net.yml/Outputs/VpcId", "net.yml/Vpc") in found
+    assert ("app.yml/Sg", "app.yml/Parameters/VpcId") in found
+    assert counts["nested_stack_count"] == 2
+    assert counts["total_resources"] == 4
+    assert counts["cross_stack_edges"] == 2
+
+
+def test_import_value_export_and_depends_on():
+    templates = {
+        "a.yml": {
+            "Resources": {"Vpc": {"Type": "AWS::EC2::VPC"}},
+            "Outputs": {
+                "VpcId": {"Value": {"Ref": "Vpc"}, "Export": {"Name": {"Fn::Sub": "${AWS::StackName}-VpcId"}}},
+            },
+        },
+        "b.yml": {
+            "Resources": {
+                "Role": {"Type": "AWS::IAM::Role"},
+                "Sg": {
+                    "Type": "AWS::EC2::SecurityGroup",
+                    "DependsOn": "Role",
+                    "Properties": {
+                        "VpcId": {"Fn::ImportValue": {"Fn::Sub": "${AWS::StackName}-VpcId"}},
+                        "GroupDescription": {"Fn::Sub": ["${Name}-sg", {"Name": {"Ref": "Role"}}]},
+                    },
+                },
+            }
+        },
+    }
+    found, counts = edges(templates)
+    assert ("b.yml/Sg", "a.yml/Outputs/VpcId") in found
+    assert ("b.yml/Sg", "b.yml/Role") in found
+    assert counts["cross_stack_edges"] == 1
+
+
+def test_same_named_templates_do_not_collide(tmp_path):
+    template = "Resources:\n  Bucket:\n    Type: AWS::S3::Bucket\n"
+    write(tmp_path / "templates" / "dev" / "storage.yml", template)
+    write(tmp_path / "templates" / "prod" / "storage.yml", template)
+    templates = load_cloudformation_templates(str(tmp_path))
+    assert list(templates) == ["dev/storage.yml", "prod/storage.yml"]
+    names, _, _, counts = build_cloudformation_graph(templates)
+    assert names == ["dev/storage.yml/Bucket", "prod/storage.yml/Bucket"]
+    assert counts["total_resources"] == 2
+
+
+def test_import_value_sub_keeps_its_references():
+    templates = {
+        "app.yml": {
+            "Parameters": {"NetworkStack": {"Type": "String"}},
+            "Resources": {
+                "Sg": {
+                    "Type": "AWS::EC2::SecurityGroup",
+                    "Properties": {"VpcId": {"Fn::ImportValue": {"Fn::Sub": "${NetworkStack}-VpcId"}}},
+                },
+            },
+        },
+    }
+    found, _ = edges(templates)
+    assert ("app.yml/Sg", "app.yml/Parameters/NetworkStack") in found
+
+
+def test_ambiguous_import_is_skipped_and_counted():
+    def exporter():
+        return {
+            "Resources": {"Vpc": {"Type": "AWS::EC2::VPC"}},
+            "Outputs": {"Id": {"Value": {"Ref": "Vpc"}, "Export": {"Name": {"Fn::Sub": "${AWS::StackName}-VpcId"}}}},
+        }
+    templates = {
+        "a.yml": exporter(),
+        "b.yml": exporter(),
+        "c.yml": {
+            "Resources": {
+                "Sg": {
+                    "Type": "AWS::EC2::SecurityGroup",
+                    "Properties": {"VpcId": {"Fn::ImportValue": {"Fn::Sub": "${Net}-VpcId"}}},
+                },
+            },
+        },
+    }
+    found, counts = edges(templates)
+    assert not {target for source, target in found if source == "c.yml/Sg"}
+    assert counts["ambiguous_imports"] == 1
+
+
+def test_templates_differing_by_extension_are_separate_stacks():
+    templates = {
+        "c.json": {"Resources": {"Vpc": {"Type": "AWS::EC2::VPC"}}},
+        "c.yml": {
+            "Resources": {"Sg": {"Type": "AWS::EC2::SecurityGroup"}},
+            "Outputs": {"Id": {"Value": {"Ref": "Sg"}, "Export": {"Name": "SgId"}}},
+        },
+        "d.yml": {
+            "Resources": {"Instance": {
+                "Type": "AWS::EC2::Instance",
+                "Properties": {"SecurityGroupIds": [{"Fn::ImportValue": "SgId"}]},
+            }},
+        },
+    }
+    names, _, _, counts = build_cloudformation_graph(templates)
+    assert "c.json/Vpc" in names and "c.yml/Sg" in names
+    assert counts["cross_stack_edges"] == 1
+
+
+def test_repository_complexity_counts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output = tmp_path / "complexity.json"
+    metrics = analyse_complexity("cloudformation", CFN_DIR, str(output))
+    assert metrics["resource_count"] == 55
+    assert metrics["module_count"] == 5
+
+
+def test_cloudformation_templates_parsed_once(tmp_path, monkeypatch):
+    import complexity_analyser
+    calls = []
+    load = complexity_analyser.load_cloudformation_templates
+    monkeypatch.setattr(complexity_analyser, "load_cloudformation_templates",
+                        lambda input_dir: calls.append(input_dir) or load(input_dir))
+    monkeypatch.chdir(tmp_path)
+    metrics = analyse_complexity("cloudformation", CFN_DIR, str(tmp_path / "complexity.json"))
+    assert len(calls) == 1
+    assert sum(metrics["resource_types"].values()) == 55
+
+
+@pytest.mark.parametrize("argv", [
+    ["--tool", "terraform", "--input-dir", ".", "--graph"],
+    ["--tool", "cloudformation", "--graph"],
+])
+def test_graph_flag_requires_cloudformation_input(argv, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["complexity_analyser.py", "--output", "out.json"] + argv)
+    with pytest.raises(SystemExit) as error:
+        runpy.run_path(ANALYSER, run_name="__main__")
+    assert error.value.code == 2
+    assert not (tmp_path / "out.json").exists()
@@ -0,0 +1,86 @@
+import numpy as np
+
+from complexity_analyser import analyse_dependency_graph, parse_dot_lines
+
+
+def parse(source):
+    names, sources, targets = parse_dot_lines(source.splitlines(True))
+    return names, sorted((names[s], names[t]) for s, t in zip(sources, targets))
+
+
+def analyse(edges, node_count):
+    names = [str(i) for i in range(node_count)]
+    sources = np.array([s for s, _ in edges], dtype=np.int64)
+    targets = np.array([t for _, t in edges], dtype=np.int64)
+    return analyse_dependency_graph(names, sources, targets)
+
+
+def test_unspaced_edge_chain():
+    names, edges = parse("digraph { a->b->c }")
+    assert names == ["a", "b", "c"]
+    assert edges == [("a", "b"), ("b", "c")]
+
+
+def test_terraform_graph_output():
+    names, edges = parse(
+        'digraph {\n'
+        '\tcompound = "true"\n'
+        '\tsubgraph "root" {\n'
+        '\t\t"[root] aws_vpc.main (expand)" [label = "aws_vpc.main", shape = "box"]\n'
+        '\t\t"[root] aws_subnet.a (expand)" -> "[root] aws_vpc.main (expand)"\n'
+        '\t}\n'
+        '}\n'
+    )
+    assert names == ["[root] aws_vpc.main (expand)", "[root] aws_subnet.a (expand)"]
+    assert edges == [("[root] aws_subnet.a (expand)", "[root] aws_vpc.main (expand)")]
+
+
+def test_keyword_after_bare_node_statement():
+    names, edges = parse("digraph G {\n x\n node [shape=box]\n y -> x\n}")
+    assert names == ["x", "y"]
+    assert edges == [("y", "x")]
+
+
+def test_subgraph_operands_expand_to_edges():
+    _, edges = parse("digraph { f -> {g h} -> i; {a b} -> c; d -> subgraph s { e } }")
+    assert edges == [
+        ("a", "c"), ("b", "c"), ("d", "e"),
+        ("f", "g"), ("f", "h"), ("g", "i"), ("h", "i"),
+    ]
+
+
+def test_attributes_ports_and_comments_are_skipped():
+    names, edges = parse(
+        '/* block\n comment */ digraph {\n'
+        '  rankdir = "RL";\n'
+        '  "a" [label="a -> b", note=[x]]; // "p" -> "q"\n'
+        '  a:port:ne -> b # trailing\n'
+        '}\n'
+    )
+    assert names == ["a", "b"]
+    assert edges == [("a", "b")]
+
+
+def test_acyclic_metrics():
+    result = analyse([(0, 1), (1, 2), (0, 2), (3, 2)], 4)
+    assert result["edges"] == 4
+    assert result["longest_chain"] == 3
+    assert result["strongly_connected_components"] == 0
+    assert result["degree_distribution"] == {"1": 1, "2": 2, "3": 1}
+    assert result["fan_in_hotspots"][0] == {"node": "2", "fan_in": 3}
+
+
+def test_cycles_and_condensed_chain():
+    # 0 -> {1 <-> 2} -> 3, plus a self-loop on 4 and a duplicate edge
+    result = analyse([(0, 1), (1, 2), (2, 1), (2, 3), (4, 4), (0, 1)], 5)
+    assert result["edges"] == 5
+    assert result["strongly_connected_components"] == 2
+    assert result["largest_scc"] == 2
+    assert result["cyclic_nodes"] == 3
+    assert result["longest_chain"] == 3
+
+
+def test_empty_graph():
+    result = analyse([], 0)
+    assert result["nodes"] == 0
+    assert result["complexity_score"] == 0.0
@@ -0,0 +1,78 @@
+import json
+
+from evaluation_aggregator import (
+    aggregate_evaluation,
+    build_comparison,
+    collect_metrics,
+    discover_artifacts,
+    extract_checkov,
+    load_cache,
+)
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+
+
+def make_run(root):
+    write(root / "complexity-results-terraform" / "terraform_final_report.json",
+          {"complexity_score": 64.0, "resource_count": 20})
+    write(root / "complexity-results-cloudformation" / "cloudformation_final_report.json",
+          {"complexity_score": 97.6, "resource_count": 50})
+    write(root / "cost-results-terraform" / "infracost.json",
+          {"totalMonthlyCost": "200", "summary": {"totalDetectedResources": 40}})
+    write(root / "cost-results-cloudformation" / "cloudformation_cost_analysis.json",
+          {"monthly_cost_estimate": 150.0, "resources": {"A": {"count": 3}}})
+    write(root / "deployment-results-terraform" / "terraform_deployment_report.json",
+          {"total_time_seconds": 376, "success": True})
+    write(root / "deployment-results-cloudformation" / "cloudformation_deployment_report.json",
+          {"deploy_time_seconds": 779, "success": True})
+    write(root / "notes" / "unrelated.json", {})
+
+
+def test_discover_classifies_by_name_and_tool(tmp_path):
+    make_run(tmp_path)
+    artifacts = discover_artifacts(str(tmp_path))
+    assert {(a["kind"], a["tool"]) for a in artifacts} == {
+        ("complexity", "terraform"), ("complexity", "cloudformation"),
+        ("cost", "terraform"), ("cost", "cloudformation"),
+        ("deployment", "terraform"), ("deployment", "cloudformation"),
+    }
+
+
+def test_comparison_uses_complexity_resource_count(tmp_path):
+    make_run(tmp_path)
+    artifacts, _ = collect_metrics(discover_artifacts(str(tmp_path)), {}, workers=1)
+    tools, comparison = build_comparison(artifacts)
+    assert tools["terraform"]["cost"]["cost_per_resource"] == 10.0
+    assert tools["cloudformation"]["cost"]["cost_per_resource"] == 3.0
+    assert comparison["deploy_time_seconds"]["best"] == "terraform"
+    assert comparison["monthly_cost"]["best"] == "cloudformation"
+
+
+def test_only_changed_artifact_is_reloaded(tmp_path):
+    run = tmp_path / "run"
+    make_run(run)
+    cache_file = str(tmp_path / "cache.json")
+    output = str(tmp_path / "report.json")
+
+    aggregate_evaluation(str(run), output, cache_file, workers=2)
+    assert len(load_cache(cache_file)) == 6
+
+    write(run / "deployment-results-terraform" / "terraform_deployment_report.json",
+          {"total_time_seconds": 100, "success": True})
+    artifacts, _ = collect_metrics(discover_artifacts(str(run)), load_cache(cache_file), workers=1)
+    reloaded = [a["relative_path"] for a in artifacts if not a["cached"]]
+    assert reloaded == ["deployment-results-terraform/terraform_deployment_report.json"]
+
+    report = aggregate_evaluation(str(run), output, cache_file)
+    assert report["comparison"]["deploy_time_seconds"]["values"]["terraform"] == 100
+
+
+def test_checkov_results_with_several_frameworks():
+    result = extract_checkov([
+        {"summary": {"passed": 6, "failed": 2}},
+        {"summary": {"passed": 2, "failed": 0}},
+    ])
+    assert result == {"pass_percentage": 80.0, "passed_checks": 8, "failed_checks": 2}